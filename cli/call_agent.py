@@ -3,7 +3,13 @@
 import os
 import sys
 import time
+import re
+import json
+import math
 import argparse
+import http.client
+import urllib.request
+import urllib.error
 import yaml
 from dotenv import load_dotenv
 from rich.console import Console
@@ -31,25 +37,38 @@ OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 LLM_MODEL = os.getenv("LLM_MODEL", "llama3.1:8b")
 EMBED_MODEL = os.getenv("EMBED_MODEL", "nomic-embed-text")
 
-PROMPT = ChatPromptTemplate.from_template(
-    """You are a helpful, bilingual (English & Indonesian) assistant.
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+OLLAMA_NUM_CTX = os.getenv("OLLAMA_NUM_CTX", "8192")
 
-TARGET LANGUAGE: {lang_label}
+# Static system part: identical bytes on every request, so Ollama can reuse
+# the KV cache for this prefix across questions. Keep per-question values
+# (language, question, context) out of it.
+SYSTEM_PROMPT = """You are a helpful, bilingual (English & Indonesian) assistant.
 
 Rules:
-- Answer **only** in the target language above.
+- Answer **only** in the TARGET LANGUAGE given with the question.
 - Length: aim for **4–8 sentences** (or concise bullet points) — not too short, but clear.
 - Use code blocks when helpful.
 - Rely **strictly** on the provided context. If the answer is not present in the context, reply exactly:
   • English → "Not found in the documents."
   • Indonesian → "Tidak ditemukan di dokumen."
+"""
+
+PROMPT = ChatPromptTemplate.from_messages(
+    [
+        ("system", SYSTEM_PROMPT),
+        (
+            "human",
+            """TARGET LANGUAGE: {lang_label}
 
 # Question
 {question}
 
 # Context
 {context}
-"""
+""",
+        ),
+    ]
 )
 
 console = Console()
@@ -82,6 +101,130 @@ def build_filter_from_profile_dict(pdef: dict | None):
             must.append(qm.FieldCondition(key=k, match=qm.MatchValue(value=str(v))))
     return qm.Filter(must=must) if must else None
 
+# ---------- Ollama residency ----------
+_GO_DURATION_PART = re.compile(r"(\d+(?:\.\d*)?|\.\d+)(ns|us|µs|μs|ms|s|m|h)")
+_GO_DURATION_UNITS = {
+    "ns": 1e-9, "us": 1e-6, "µs": 1e-6, "μs": 1e-6, "ms": 1e-3, "s": 1, "m": 60, "h": 3600,
+}
+
+def parse_keep_alive(value) -> int:
+    """
+    Ollama keep_alive → whole seconds (-1 = forever).
+    Accepts plain seconds ("600", "-1") or Go durations ("30m", "1h30m", "5m0s", "500ms"),
+    same as the server's OLLAMA_KEEP_ALIVE. Raises ValueError on anything else.
+    """
+    v = str(value).strip()
+    try:
+        secs = float(v)
+    except ValueError:
+        sign, body = (-1, v[1:]) if v[:1] == "-" else (1, v.lstrip("+"))
+        parts = _GO_DURATION_PART.findall(body)
+        if not body or "".join(n + u for n, u in parts) != body:
+            raise ValueError(f"invalid keep_alive {value!r} (use seconds or a duration like 30m, 1h30m, -1)")
+        secs = sign * sum(float(n) * _GO_DURATION_UNITS[u] for n, u in parts)
+    if not math.isfinite(secs):
+        raise ValueError(f"invalid keep_alive {value!r}")
+    if secs < 0:
+        return -1
+    # round up so "500ms" keeps the model briefly instead of unloading it (0 = unload now)
+    return math.ceil(secs)
+
+def parse_num_ctx(value) -> int:
+    """LLM context window (tokens) → positive int. Raises ValueError on anything else."""
+    try:
+        n = int(str(value).strip())
+    except ValueError:
+        raise ValueError(f"invalid num_ctx {value!r} (expected a positive integer, e.g. 8192)")
+    if n <= 0:
+        raise ValueError(f"invalid num_ctx {value!r} (must be > 0)")
+    return n
+
+def make_embeddings(keep_alive: int):
+    return OllamaEmbeddings(base_url=OLLAMA_BASE_URL, model=EMBED_MODEL, keep_alive=keep_alive)
+
+def make_llm(keep_alive: int, num_ctx: int):
+    # num_ctx must match the warm-up request, otherwise Ollama reloads the model
+    return ChatOllama(
+        base_url=OLLAMA_BASE_URL,
+        model=LLM_MODEL,
+        temperature=0.2,
+        keep_alive=keep_alive,
+        num_ctx=num_ctx,
+    )
+
+def _ollama_post(path: str, payload: dict):
+    req = urllib.request.Request(
+        OLLAMA_BASE_URL.rstrip("/") + path,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    return urllib.request.urlopen(req, timeout=300)
+
+def _model_ref(name: str) -> str:
+    """Ollama reports tagged names: 'nomic-embed-text' → 'nomic-embed-text:latest'."""
+    return name if ":" in name.rsplit("/", 1)[-1] else name + ":latest"
+
+def _resident_models() -> set[str]:
+    with urllib.request.urlopen(OLLAMA_BASE_URL.rstrip("/") + "/api/ps", timeout=10) as r:
+        data = json.load(r)
+    return {_model_ref(m.get("name") or m.get("model", "")) for m in data.get("models", [])}
+
+def _chat_first_token(keep_alive: int, num_ctx: int) -> tuple[float, float]:
+    """Stream one chat turn with the static system prefix; return (first-token s, load s)."""
+    payload = {
+        "model": LLM_MODEL,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": "ping"},
+        ],
+        "stream": True,
+        "keep_alive": keep_alive,
+        "options": {"num_ctx": num_ctx, "num_predict": 1},
+    }
+    t0 = time.time()
+    first = None
+    load = 0.0
+    with _ollama_post("/api/chat", payload) as r:
+        for line in r:
+            if not line.strip():
+                continue
+            chunk = json.loads(line)
+            if first is None:
+                first = time.time() - t0
+            if chunk.get("done"):
+                load = chunk.get("load_duration", 0) / 1e9
+    return (first if first is not None else time.time() - t0), load
+
+def warm_up(keep_alive: int, num_ctx: int) -> bool:
+    """
+    Load EMBED_MODEL and LLM_MODEL into Ollama and prime the KV cache with SYSTEM_PROMPT.
+    Prints cold vs warm first-token latency. Returns False if Ollama is unreachable.
+    """
+    try:
+        resident = _resident_models()
+
+        t0 = time.time()
+        with _ollama_post("/api/embed", {"model": EMBED_MODEL, "input": "warm-up", "keep_alive": keep_alive}) as r:
+            r.read()
+        embed_s = time.time() - t0
+
+        cold, load = _chat_first_token(keep_alive, num_ctx)
+        warm, _ = _chat_first_token(keep_alive, num_ctx)
+    except (urllib.error.URLError, OSError, http.client.HTTPException, ValueError) as e:
+        console.print(f"[yellow]warm-up skipped:[/yellow] {e}")
+        return False
+
+    def state(model):
+        return "already resident" if _model_ref(model) in resident else "loaded"
+
+    console.print(
+        f"[dim]warm-up (keep_alive={keep_alive}s, num_ctx={num_ctx}) | "
+        f"{EMBED_MODEL} {embed_s:.3f}s ({state(EMBED_MODEL)}) | "
+        f"{LLM_MODEL} first-token cold {cold:.3f}s (load {load:.3f}s, {state(LLM_MODEL)}) "
+        f"→ warm {warm:.3f}s[/dim]"
+    )
+    return True
+
 # ---------- Heuristic profile guess ----------
 def guess_profile_from_query(q: str) -> str | None:
     ql = q.lower()
@@ -121,13 +264,23 @@ def detect_lang(q: str) -> str:
 
 
 # ---------- Core ----------
-def retrieve_and_answer(question: str, profile_name: str | None, k: int = 8):
+def retrieve_and_answer(
+    question: str,
+    profile_name: str | None,
+    k: int = 8,
+    keep_alive: int | None = None,
+    num_ctx: int | None = None,
+):
+    if keep_alive is None:
+        keep_alive = parse_keep_alive(OLLAMA_KEEP_ALIVE)
+    if num_ctx is None:
+        num_ctx = parse_num_ctx(OLLAMA_NUM_CTX)
     profiles = load_profiles()
     profile_def = profiles.get(profile_name) if profile_name else None
     qfilter = build_filter_from_profile_dict(profile_def)
 
     t0 = time.time()
-    embeddings = OllamaEmbeddings(base_url=OLLAMA_BASE_URL, model=EMBED_MODEL)
+    embeddings = make_embeddings(keep_alive)
     vs = QdrantVectorStore.from_existing_collection(
         url=QDRANT_URL,
         collection_name=QDRANT_COLLECTION,
@@ -171,7 +324,7 @@ def retrieve_and_answer(question: str, profile_name: str | None, k: int = 8):
         ]
     )
 
-    llm = ChatOllama(base_url=OLLAMA_BASE_URL, model=LLM_MODEL, temperature=0.2)
+    llm = make_llm(keep_alive, num_ctx)
     lang = detect_lang(question)
     lang_label = "English" if lang == "en" else "Indonesian"
     chain = PROMPT | llm
@@ -261,9 +414,14 @@ def main():
     ap.add_argument("-p", "--profile", help="Profile name (overrides current). Use 'all' for no filter.")
     ap.add_argument("--set-profile", help="Set default profile and exit. Use 'all' to clear.")
     ap.add_argument("-k", "--topk", type=int, default=8, help="Top-k retrieval (default 8)")
+    ap.add_argument("--keep-alive", default=OLLAMA_KEEP_ALIVE,
+                    help="How long Ollama keeps models loaded, e.g. 30m, 1h30m, 600, -1 (default $OLLAMA_KEEP_ALIVE or 30m)")
+    ap.add_argument("--num-ctx", default=OLLAMA_NUM_CTX,
+                    help="LLM context window (default $OLLAMA_NUM_CTX or 8192)")
+    ap.add_argument("--warmup", action="store_true", help="Preload embed + LLM models into Ollama and exit")
+    ap.add_argument("--no-warmup", action="store_true", help="Skip model warm-up at REPL start")
     ap.add_argument("question", nargs="*", help="Question (if empty → REPL mode)")
     args = ap.parse_args()
-
     # Set default profile and exit
     if args.set_profile is not None:
         name = args.set_profile
@@ -279,6 +437,21 @@ def main():
         console.print(f"[green]Default profile set to:[/green] {name}")
         return
 
+    try:
+        keep_alive = parse_keep_alive(args.keep_alive)
+    except ValueError as e:
+        console.print(f"[red]Invalid --keep-alive / OLLAMA_KEEP_ALIVE:[/red] {e}")
+        sys.exit(2)
+    try:
+        num_ctx = parse_num_ctx(num_ctx)
+    except ValueError as e:
+        console.print(f"[red]Invalid --num-ctx / OLLAMA_NUM_CTX:[/red] {e}")
+        sys.exit(2)
+
+    # Preload models and exit (used by rag-up)
+    if args.warmup:
+        sys.exit(0 if warm_up(keep_alive, num_ctx) else 1)
+
     # Resolve active profile
     if args.profile:
         active_profile = None if args.profile == "all" else args.profile
@@ -289,7 +462,9 @@ def main():
     # One-shot
     if args.question:
         question = " ".join(args.question)
-        answer, docs, timings, pname, pdef = retrieve_and_answer(question, active_profile, k=args.topk)
+        answer, docs, timings, pname, pdef = retrieve_and_answer(
+            question, active_profile, k=args.topk, keep_alive=keep_alive, num_ctx=num_ctx
+        )
         print_answer(answer, docs, timings, pname, pdef)
         return
 
@@ -298,6 +473,8 @@ def main():
     prof_label = session_profile or "all"
     console.print(f"[bold]call-agent[/bold] — REPL mode. Current profile: [green]{prof_label}[/green]")
     console.print("[dim]Commands: :profile list | :profile show | :profile set <name>|all[/dim]")
+    if not args.no_warmup:
+        warm_up(keep_alive, num_ctx)
     while True:
         try:
             q = console.input(">>> ").strip()
@@ -309,7 +486,7 @@ def main():
             # retrieve_and_answer() sekarang return 5 values:
             # (answer, docs, timings, profile_used, profile_def)
             answer, docs, timings, pname, pdef = retrieve_and_answer(
-                q, session_profile, k=args.topk
+                q, session_profile, k=args.topk, keep_alive=keep_alive, num_ctx=num_ctx
             )
             # print_answer() terima 5 argumen juga
             print_answer(answer, docs, timings, pname, pdef)
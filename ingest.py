@@ -1,12 +1,17 @@
 # ingest.py — parametris: pilih koleksi & folder korpus
 import os
+import json
+import zipfile
 import argparse
+import numpy as np
 from dotenv import load_dotenv
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_ollama import OllamaEmbeddings
 from langchain_qdrant import QdrantVectorStore
 from qdrant_client import QdrantClient
+from qdrant_client.http import models as qm
+from qdrant_client.http.exceptions import UnexpectedResponse, ResponseHandlingException
 
 from utils.loaders import load_corpus  # ini sudah ada di proyekmu
 
@@ -15,6 +20,170 @@ QDRANT_URL = os.getenv("QDRANT_URL", "http://localhost:6333")
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 EMBED_MODEL = os.getenv("EMBED_MODEL", "nomic-embed-text")
 
+ARTIFACT_FORMAT = "rag-collection"
+ARTIFACT_VERSION = 1
+
+def _vector_params(qc: QdrantClient, collection: str):
+    """Return (vector_name, VectorParams); vector_name '' = unnamed (langchain default)."""
+    vectors = qc.get_collection(collection).config.params.vectors
+    if isinstance(vectors, dict):
+        name, params = next(iter(vectors.items()))
+        return name, params
+    return "", vectors
+
+def _distance_name(distance) -> str:
+    return distance.value if hasattr(distance, "value") else str(distance)
+
+def export_collection(
+    qc: QdrantClient,
+    collection: str,
+    path: str,
+    batch_size: int = 1024,
+    embed_model: str = EMBED_MODEL,
+) -> int:
+    """
+    Dump vectors, IDs and payloads of a collection into a NumPy .npz artifact.
+    Qdrant doesn't know which model produced the vectors, so the header's embed_model
+    is whatever the caller says (default: current EMBED_MODEL).
+    Layout:
+      header   JSON (format, version, embed_model, dim, distance, vector_name, count)
+      vectors  float32 [count, dim]
+      ids      str [count]
+      payloads utf-8 JSON lines (one payload per point)
+    """
+    vector_name, params = _vector_params(qc, collection)
+    dim = params.size
+
+    # float32 array per scroll batch — never the whole collection as Python floats
+    ids, batches, payloads = [], [], []
+    offset = None
+    while True:
+        points, offset = qc.scroll(
+            collection_name=collection,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+        batch = np.empty((len(points), dim), dtype=np.float32)
+        for i, pt in enumerate(points):
+            batch[i] = pt.vector[vector_name] if isinstance(pt.vector, dict) else pt.vector
+            ids.append(str(pt.id))
+            payloads.append(json.dumps(pt.payload or {}, ensure_ascii=False))
+        batches.append(batch)
+        if offset is None:
+            break
+
+    header = {
+        "format": ARTIFACT_FORMAT,
+        "version": ARTIFACT_VERSION,
+        "collection": collection,
+        "embed_model": embed_model,
+        "dim": dim,
+        "distance": _distance_name(params.distance),
+        "vector_name": vector_name,
+        "count": len(ids),
+    }
+    np.savez_compressed(
+        path,
+        header=np.array(json.dumps(header)),
+        vectors=np.concatenate(batches) if ids else np.empty((0, dim), dtype=np.float32),
+        ids=np.array(ids, dtype=str),
+        payloads=np.frombuffer("\n".join(payloads).encode("utf-8"), dtype=np.uint8),
+    )
+    return len(ids)
+
+def load_artifact(path: str) -> dict:
+    """
+    Read and validate an export_collection() artifact without touching Qdrant.
+    Returns {header, vectors, ids, payloads}; raises ValueError/OSError if unusable.
+    """
+    def bad(reason):
+        return ValueError(f"{path}: not a valid {ARTIFACT_FORMAT} artifact ({reason})")
+
+    try:
+        data = np.load(path, allow_pickle=False)
+    except zipfile.BadZipFile as e:
+        raise bad(e)
+    if not isinstance(data, np.lib.npyio.NpzFile):
+        raise bad("expected an .npz archive")
+    try:
+        with data:
+            header = json.loads(str(data["header"]))
+            vectors = data["vectors"]
+            ids = [str(i) for i in data["ids"].tolist()]
+            blob = data["payloads"].tobytes().decode("utf-8")
+    except (KeyError, zipfile.BadZipFile, UnicodeDecodeError) as e:
+        raise bad(e)
+
+    if not isinstance(header, dict) or header.get("format") != ARTIFACT_FORMAT:
+        raise bad("unknown format")
+    try:
+        version = int(header.get("version", 0))
+        count, dim = int(header["count"]), int(header["dim"])
+        distance = qm.Distance(header["distance"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise bad(f"header: {e}")
+    if version > ARTIFACT_VERSION:
+        raise ValueError(f"{path}: artifact version {version} is newer than supported ({ARTIFACT_VERSION})")
+    if vectors.shape != (count, dim):
+        raise bad(f"vectors shape {vectors.shape} does not match header ({count}, {dim})")
+
+    payloads = [json.loads(line) for line in blob.split("\n")] if blob else []
+    if not (len(payloads) == len(ids) == count):
+        raise bad(f"{len(ids)} ids / {len(payloads)} payloads, header count {count}")
+
+    header.update(count=count, dim=dim, distance=distance.value)
+    return {
+        "header": header,
+        "vectors": vectors,
+        # Qdrant IDs are unsigned ints or UUIDs
+        "ids": [int(i) if i.isdigit() else i for i in ids],
+        "payloads": payloads,
+    }
+
+def import_collection(
+    qc: QdrantClient,
+    collection: str,
+    artifact: dict,
+    batch_size: int = 256,
+    parallel: int = 4,
+) -> int:
+    """Bulk-load a load_artifact() result into Qdrant with batched upserts (parallel=1 → serial)."""
+    header, vectors = artifact["header"], artifact["vectors"]
+    if header.get("embed_model") != EMBED_MODEL:
+        print(f"[warn] artifact embedded with '{header.get('embed_model')}', but EMBED_MODEL={EMBED_MODEL} (query results will be wrong)")
+
+    vector_name = header.get("vector_name", "")
+    params = qm.VectorParams(size=header["dim"], distance=qm.Distance(header["distance"]))
+    if not qc.collection_exists(collection):
+        qc.create_collection(
+            collection_name=collection,
+            vectors_config={vector_name: params} if vector_name else params,
+        )
+    else:
+        # check before uploading — a mismatch would fail mid-upload and leave a partial load
+        cur_name, cur = _vector_params(qc, collection)
+        want = (vector_name, params.size, _distance_name(params.distance))
+        have = (cur_name, cur.size, _distance_name(cur.distance))
+        if want != have:
+            raise ValueError(
+                f"collection '{collection}' has vector (name={have[0]!r}, dim={have[1]}, distance={have[2]}) "
+                f"but artifact has (name={want[0]!r}, dim={want[1]}, distance={want[2]}); "
+                f"use --recreate or another --collection"
+            )
+
+    qc.upload_collection(
+        collection_name=collection,
+        vectors={vector_name: vectors} if vector_name else vectors,
+        payload=artifact["payloads"],
+        ids=artifact["ids"],
+        batch_size=batch_size,
+        parallel=parallel,
+        wait=True,
+    )
+    return len(artifact["ids"])
+
 def main():
     ap = argparse.ArgumentParser(description="Ingest Markdown corpus to Qdrant collection.")
     ap.add_argument("--corpus", default="corpus", help="Folder korpus (default: corpus)")
@@ -22,8 +191,37 @@ def main():
     ap.add_argument("--recreate", action="store_true", help="Drop & create ulang koleksi terlebih dahulu")
     ap.add_argument("--chunk-size", type=int, default=900)
     ap.add_argument("--chunk-overlap", type=int, default=150)
+    ap.add_argument("--export", metavar="FILE", help="Dump koleksi (vectors, IDs, payloads) ke artifact .npz lalu keluar")
+    ap.add_argument("--import", dest="import_path", metavar="FILE",
+                    help="Bulk-load artifact .npz ke koleksi tanpa embedding ulang (tanpa Ollama)")
+    ap.add_argument("--embed-model", default=EMBED_MODEL,
+                    help="Model embedding koleksi, dicatat di header --export (default: EMBED_MODEL saat ini)")
+    ap.add_argument("--batch-size", type=int, default=256, help="Ukuran batch upsert untuk --import (default 256)")
+    ap.add_argument("--workers", type=int, default=4, help="Jumlah upsert paralel untuk --import (default 4)")
     args = ap.parse_args()
 
+    if args.export:
+        qc = QdrantClient(url=QDRANT_URL)
+        try:
+            n = export_collection(qc, args.collection, args.export, embed_model=args.embed_model)
+        except (ValueError, UnexpectedResponse, ResponseHandlingException, OSError) as e:
+            print(f"[err] export '{args.collection}': {e}")
+            return
+        print(f"[ok] Exported {n} points from '{args.collection}' to '{args.export}'")
+        return
+
+    # load & validate the artifact first, so --recreate never drops a collection for a bad file
+    artifact = None
+    if args.import_path:
+        if args.workers < 1 or args.batch_size < 1:
+            print("[err] --workers and --batch-size must be >= 1")
+            return
+        try:
+            artifact = load_artifact(args.import_path)
+        except (ValueError, OSError) as e:
+            print(f"[err] {e}")
+            return
+
     # (opsional) recreate collection
     if args.recreate:
         try:
@@ -33,6 +231,16 @@ def main():
         except Exception as e:
             print(f"[warn] delete_collection: {e} (lanjut)")
 
+    if artifact is not None:
+        qc = QdrantClient(url=QDRANT_URL)
+        try:
+            n = import_collection(qc, args.collection, artifact, batch_size=args.batch_size, parallel=args.workers)
+        except (ValueError, UnexpectedResponse, ResponseHandlingException, OSError) as e:
+            print(f"[err] {e}")
+            return
+        print(f"[ok] Imported {n} points into '{args.collection}' from '{args.import_path}'")
+        return
+
     raw_docs = load_corpus(args.corpus)
     if not raw_docs:
         print(f"[err] No documents found in {args.corpus}")
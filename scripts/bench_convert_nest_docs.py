@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# Throughput benchmark for convert_nest_docs.py on a synthetic MDX tree.
+import os, sys, time, random, shutil, argparse, tempfile
+from functools import partial
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import convert_nest_docs as cnd
+
+MDX_LINES = [
+    "import {{ Callout }} from '@/components/callout';",
+    "export const meta = {{ title: 'Page {i}' }}",
+    "### Section {i}",
+    "Controllers handle incoming **requests** and return responses to the client.",
+    "A provider can be injected as a dependency; see `@Injectable()` for details.",
+    "",
+    "<Tabs>",
+    "<Tab label=\"TypeScript\">",
+    "```typescript",
+    "@Controller('cats')",
+    "export class CatsController {{}}",
+    "```",
+    "</Tab>",
+    "</Tabs>",
+    "<Callout type=\"info\">",
+    "Guards run after middleware and before interceptors or pipes.",
+    "</Callout>",
+    "<br />",
+    "<DocsCard href=\"/guards\">",
+    "</DocsCard>",
+    "",
+    "",
+    "",
+]
+
+def legacy_convert_mdx_text(text: str) -> str:
+    """Previous implementation: eight separate .match calls per line (reference)."""
+    out = []
+    for line in text.splitlines():
+        if cnd.RE_IMPORT.match(line) or cnd.RE_EXPORT.match(line):
+            continue
+        if cnd.RE_TS_BLOCK.match(line):
+            continue
+        if cnd.RE_CALLOUT_OPEN.match(line):
+            out.append("> **Note**")
+            continue
+        if cnd.RE_CALLOUT_CLOSE.match(line):
+            continue
+        if cnd.RE_COMPONENT_TAG.match(line) or cnd.RE_COMPONENT_CLOSE.match(line) or cnd.RE_EMPTY_HTML.match(line):
+            continue
+        out.append(line)
+    return cnd.re.sub(r"\n{3,}", "\n\n", "\n".join(out)).strip() + "\n"
+
+def make_tree(root: str, files: int, lines: int, seed: int = 0) -> int:
+    rnd = random.Random(seed)
+    total = 0
+    for n in range(files):
+        d = os.path.join(root, f"section{n % 16}", f"topic{n % 7}")
+        os.makedirs(d, exist_ok=True)
+        ext = ".mdx" if n % 5 else ".md"
+        text = "\n".join(rnd.choice(MDX_LINES).format(i=n) for _ in range(lines)) + "\n"
+        with open(os.path.join(d, f"page{n}{ext}"), "w", encoding="utf-8") as f:
+            f.write(text)
+        total += len(text.encode("utf-8"))
+    return total
+
+def timed(label: str, fn, files: int, size: int):
+    t0 = time.perf_counter()
+    result = fn()
+    dt = time.perf_counter() - t0
+    print(f"{label:<34} {dt:8.3f}s  {files / dt:10.1f} files/s  {size / dt / 1e6:8.2f} MB/s  {result}")
+    return result
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark convert_nest_docs on a synthetic MDX tree.")
+    ap.add_argument("--files", type=int, default=2000)
+    ap.add_argument("--lines", type=int, default=400, help="Lines per file")
+    ap.add_argument("-j", "--workers", type=int, default=None, help="Pool size for the parallel run (default: CPU count)")
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_nest_")
+    try:
+        src = os.path.join(tmp, "content")
+        size = make_tree(src, args.files, args.lines)
+        print(f"synthetic tree: {args.files} files, {size / 1e6:.1f} MB, workers={args.workers or os.cpu_count()}")
+
+        texts = []
+        for p in cnd.list_sources(src):
+            with open(p, "r", encoding="utf-8") as f:
+                texts.append(f.read())
+        assert all(cnd.convert_mdx_text(t) == legacy_convert_mdx_text(t) for t in texts), "output mismatch"
+
+        timed("line pass: 8 patterns (legacy)", lambda: len([legacy_convert_mdx_text(t) for t in texts]), args.files, size)
+        timed("line pass: combined pattern", lambda: len([cnd.convert_mdx_text(t) for t in texts]), args.files, size)
+
+        def run(dst, **kw):
+            return partial(cnd.convert_tree, src, os.path.join(tmp, dst), verbose=False, **kw)
+
+        timed("tree: serial, cold", run("serial", workers=1), args.files, size)
+        timed("tree: parallel, cold", run("parallel", workers=args.workers), args.files, size)
+        timed("tree: parallel, rerun (manifest)", run("parallel", workers=args.workers), args.files, size)
+        for p in cnd.list_sources(src):
+            os.utime(p)
+        timed("tree: parallel, touched (hash)", run("parallel", workers=args.workers), args.files, size)
+        timed("tree: parallel, --force (content)", run("parallel", workers=args.workers, force=True), args.files, size)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
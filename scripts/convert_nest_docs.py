@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
-import os, re, sys, shutil, pathlib
+import os, re, sys, json, shutil, hashlib, pathlib, argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
 SRC = os.path.expanduser("~/tmp/docs.nestjs.com/content")
 DST = os.path.expanduser("~/RAG/corpus/nestjs/11/en")
@@ -24,64 +26,166 @@ RE_COMPONENT_TAG = re.compile(r"^<\s*[A-Z][A-Za-z0-9]*(\s[^>]*)?>\s*$")
 RE_COMPONENT_CLOSE = re.compile(r"^</\s*[A-Z][A-Za-z0-9]*\s*>\s*$")
 RE_EMPTY_HTML = re.compile(r"^\s*<br\s*/?>\s*$")
 
+# Single pass per line: one combined pattern instead of eight .match calls.
+# "note" must stay first — a Callout open tag also looks like a generic component tag.
+RE_COMBINED = re.compile(
+    "(?P<note>%s)|(?P<drop>%s)" % (
+        RE_CALLOUT_OPEN.pattern,
+        "|".join(r.pattern for r in (
+            RE_IMPORT, RE_EXPORT, RE_TS_BLOCK, RE_CALLOUT_CLOSE,
+            RE_COMPONENT_TAG, RE_COMPONENT_CLOSE, RE_EMPTY_HTML,
+        )),
+    )
+)
+
 def convert_mdx_text(text: str) -> str:
     out = []
-    skip_block = False
+    match = RE_COMBINED.match
     for line in text.splitlines():
-        if RE_IMPORT.match(line) or RE_EXPORT.match(line):
-            continue
-        if RE_TS_BLOCK.match(line):
-            continue
-        if RE_CALLOUT_OPEN.match(line):
+        m = match(line)
+        if m is None:
+            out.append(line)
+        elif m.lastgroup == "note":
             out.append("> **Note**")
-            skip_block = False
-            continue
-        if RE_CALLOUT_CLOSE.match(line):
-            skip_block = False
-            continue
-        if RE_COMPONENT_TAG.match(line) or RE_COMPONENT_CLOSE.match(line) or RE_EMPTY_HTML.match(line):
-            continue
-        out.append(line)
     # tidy up extra blank lines
     cleaned = re.sub(r"\n{3,}", "\n\n", "\n".join(out)).strip() + "\n"
     return cleaned
 
-def process_file(src_path: str, dst_root: str):
-    rel = os.path.relpath(src_path, SRC)
+# Bump when convert_mdx_text() logic changes; the regexes and frontmatter are hashed in anyway.
+CONVERTER_VERSION = 2
+CONVERTER_KEY = hashlib.sha256(
+    "\0".join([str(CONVERTER_VERSION), RE_COMBINED.pattern, FRONTMATTER_TMPL]).encode("utf-8")
+).hexdigest()
+
+# Per-source record of what the outputs were built from. Kept inside DST without a
+# .json/.md suffix so utils.loaders.load_corpus doesn't ingest it.
+MANIFEST_NAME = ".convert_manifest"
+
+def load_manifest(dst_root: str) -> dict:
+    """Return {relpath: {size, mtime, sha256}}; empty if missing or built by another converter."""
+    try:
+        with open(os.path.join(dst_root, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if data.get("converter") != CONVERTER_KEY:
+        print("Converter patterns/frontmatter changed — re-checking all outputs.")
+        return {}
+    return data.get("files", {})
+
+def save_manifest(dst_root: str, files: dict):
+    path = os.path.join(dst_root, MANIFEST_NAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"converter": CONVERTER_KEY, "files": files}, f, indent=0, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+def process_file(src_path: str, dst_root: str, src_root: str = SRC, force: bool = False, entry: dict | None = None):
+    """
+    Convert one file. `entry` is its manifest record from the previous run.
+    Returns (dst_path, status, new_entry) with status:
+      "skipped"   — source size+mtime or content hash match the manifest (not converted)
+      "unchanged" — converted, but output content is identical (file left untouched)
+      "written"   — output created or updated
+    """
+    rel = os.path.relpath(src_path, src_root)
     # normalize extension to .md
     rel_md = os.path.splitext(rel)[0] + ".md"
     dst_path = os.path.join(dst_root, rel_md)
-    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
 
-    with open(src_path, "r", encoding="utf-8") as f:
-        text = f.read()
+    st = os.stat(src_path)
+    fresh = not force and entry is not None and os.path.exists(dst_path)
+    if fresh and entry.get("size") == st.st_size and entry.get("mtime") == st.st_mtime_ns:
+        return dst_path, "skipped", entry
+
+    with open(src_path, "rb") as f:
+        raw = f.read()
+    new_entry = {"size": st.st_size, "mtime": st.st_mtime_ns, "sha256": hashlib.sha256(raw).hexdigest()}
+    # touched but same content (git pull, fresh clone): just refresh the manifest record
+    if fresh and entry.get("sha256") == new_entry["sha256"]:
+        return dst_path, "skipped", new_entry
 
+    text = raw.decode("utf-8")
     if src_path.endswith(".mdx"):
         body = convert_mdx_text(text)
     else:
         body = text
 
     fm = FRONTMATTER_TMPL.format(rel=rel.replace("\\", "/"))
-    with open(dst_path, "w", encoding="utf-8") as f:
-        f.write(fm + body)
-    return dst_path
+    data = (fm + body).encode("utf-8")
+
+    # keep unchanged outputs untouched so downstream ingest doesn't see them as modified
+    try:
+        with open(dst_path, "rb") as f:
+            if f.read() == data:
+                return dst_path, "unchanged", new_entry
+    except FileNotFoundError:
+        pass
+
+    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+    with open(dst_path, "wb") as f:
+        f.write(data)
+    return dst_path, "written", new_entry
+
+def _process_job(item, dst_root: str, src_root: str, force: bool):
+    src_path, entry = item
+    return process_file(src_path, dst_root, src_root=src_root, force=force, entry=entry)
+
+def list_sources(src_root: str):
+    srcs = []
+    for root, _, files in os.walk(src_root):
+        for name in files:
+            if name.endswith(".md") or name.endswith(".mdx"):
+                srcs.append(os.path.join(root, name))
+    return srcs
+
+def convert_tree(src_root: str, dst_root: str, workers: int | None = None, force: bool = False, verbose: bool = True):
+    """
+    Convert every .md/.mdx under src_root into dst_root. Returns {status: count}.
+    workers: pool size (None = CPU count, <= 1 = serial).
+    """
+    os.makedirs(dst_root, exist_ok=True)
+    srcs = list_sources(src_root)
+    manifest = load_manifest(dst_root)
+    items = [(p, manifest.get(os.path.relpath(p, src_root))) for p in srcs]
+    job = partial(_process_job, dst_root=dst_root, src_root=src_root, force=force)
+    counts = {"written": 0, "unchanged": 0, "skipped": 0}
+    files = {}
+
+    if workers is not None and workers <= 1:
+        results = map(job, items)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(job, items, chunksize=max(1, len(items) // ((workers or os.cpu_count() or 1) * 4)))
+    try:
+        for (src, _), (out, status, entry) in zip(items, results):
+            counts[status] += 1
+            files[os.path.relpath(src, src_root)] = entry
+            if verbose and status == "written" and counts["written"] % 20 == 0:
+                print(f"[{counts['written']}] {out}")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        # record whatever finished, so an interrupted run still resumes incrementally
+        save_manifest(dst_root, files)
+    return counts
 
 def main():
-    if not os.path.isdir(SRC):
-        print(f"Source not found: {SRC}")
+    ap = argparse.ArgumentParser(description="Convert NestJS docs (.md/.mdx) into the RAG corpus.")
+    ap.add_argument("--src", default=SRC, help=f"NestJS content folder (default: {SRC})")
+    ap.add_argument("--dst", default=DST, help=f"Output corpus folder (default: {DST})")
+    ap.add_argument("-j", "--workers", type=int, default=None, help="Process pool size (default: CPU count; <= 1 = serial)")
+    ap.add_argument("--force", action="store_true", help="Re-convert every file, ignoring the manifest")
+    args = ap.parse_args()
+
+    if not os.path.isdir(args.src):
+        print(f"Source not found: {args.src}")
         sys.exit(1)
-    os.makedirs(DST, exist_ok=True)
-    count = 0
-    for root, _, files in os.walk(SRC):
-        for name in files:
-            if not (name.endswith(".md") or name.endswith(".mdx")):
-                continue
-            src = os.path.join(root, name)
-            out = process_file(src, DST)
-            count += 1
-            if count % 20 == 0:
-                print(f"[{count}] {out}")
-    print(f"Done. Converted {count} files into {DST}")
+    counts = convert_tree(args.src, args.dst, workers=args.workers, force=args.force)
+    print(
+        f"Done. {counts['written']} written, {counts['unchanged']} unchanged, "
+        f"{counts['skipped']} skipped (up to date) into {args.dst}"
+    )
 
 if __name__ == "__main__":
     main()